@@ -8,6 +8,7 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from .dataio import load_config, load_data, write_data
@@ -75,17 +76,17 @@ class SpeakerBiasTest(BiasTest):
         self.metrics = pd.DataFrame()
 
         self.config = load_config(config_file)
-        try:
-            self.config["id_delimiter"]
-        except KeyError:
-            self.id_delimiter = "/"
-        else:
-            self.id_delimiter = self.config["id_delimiter"]
+        # optional attributes
+        self.id_delimiter = self.config.get("id_delimiter", "/")
 
         scores_input = load_data(scores)
         speaker_metadata_input = load_data(self.config['speaker_metadata_file'])
 
         self._check_input(scores_input, speaker_metadata_input)
+        # n_jobs: -1 uses all CPU cores
+        self.n_jobs = self.config.get("n_jobs", 1)
+        if self.n_jobs == -1:
+            self.n_jobs = os.cpu_count()
 
         # scores_input columns selection, reordering and renaming
         scores_input = scores_input[[self.config["label_column"],
@@ -109,6 +110,9 @@ class SpeakerBiasTest(BiasTest):
 
         self.speaker_metadata = speaker_metadata_input.rename(columns={self.config["id_column"]: "id"})
         self.speaker_metadata = self.speaker_metadata.astype({"id": "str"})
+        # speaker group columns have few distinct values, categorical codes speed up grouping and comparisons
+        speaker_group_columns = {speaker_group for group_sublist in self.config["speaker_groups"] for speaker_group in group_sublist}
+        self.speaker_metadata = self.speaker_metadata.astype({speaker_group: "category" for speaker_group in speaker_group_columns})
 
         config_file_name = Path(config_file).stem
         if isinstance(scores, str):
@@ -144,21 +148,15 @@ class SpeakerBiasTest(BiasTest):
         """
 
         # check config file
-        try:
-            self.config["id_column"]
-        except KeyError:
+        if "id_column" not in self.config:
             print("Error: id_column not specified in config file")
             sys.exit(1)
 
-        try:
-            self.config["select_columns"]
-        except KeyError:
+        if "select_columns" not in self.config:
             print("Error: select_columns not specified in config file")
             sys.exit(1)
 
-        try:
-            self.config["speaker_groups"]
-        except KeyError:
+        if "speaker_groups" not in self.config:
             print("Error: speaker_groups not specified in config file")
             sys.exit(1)
 
@@ -171,53 +169,45 @@ class SpeakerBiasTest(BiasTest):
         speaker_group_list = [speaker_group for group_sublist in self.config["speaker_groups"] for speaker_group in group_sublist]
         speaker_group_list = np.unique(speaker_group_list)
         for speaker_group in speaker_group_list:
-            try:
-                self.config["select_columns"].index(speaker_group)
-            except ValueError:
+            if speaker_group not in self.config["select_columns"]:
                 print("Error: " + speaker_group + " not found in select_columns as specified in config file")
                 sys.exit(1)
 
+        # check that optional n_jobs is a positive integer or -1
+        n_jobs = self.config.get("n_jobs", 1)
+        if isinstance(n_jobs, bool) or not isinstance(n_jobs, int) or (n_jobs < 1 and n_jobs != -1):
+            print("Error: n_jobs in config file must be a positive integer or -1 to use all CPU cores")
+            sys.exit(1)
+
         # check if dcf costs PTarget is between 0 and 1
         for dcf_costs in self.config["dcf_costs"]:
             if (dcf_costs[0] <= 0.0) | (dcf_costs[0] >= 1.0):
                 raise Exception("PTarget in DCF Costs needs to be between 0 and 1")
 
         # check scores_input
-        try:
-            list(scores_input.columns).index(self.config["reference_filepath_column"])
-        except ValueError:
+        if self.config["reference_filepath_column"] not in scores_input.columns:
             print("Error: reference filepath column '" + self.config["reference_filepath_column"] + "' as specified in config file not found in scores file")
             sys.exit(1)
 
-        try:
-            list(scores_input.columns).index(self.config["test_filepath_column"])
-        except ValueError:
+        if self.config["test_filepath_column"] not in scores_input.columns:
             print("Error: test filepath column '" + self.config["test_filepath_column"] + "' as specified in config file not found in scores file")
             sys.exit(1)
 
-        try:
-            list(scores_input.columns).index(self.config["label_column"])
-        except ValueError:
+        if self.config["label_column"] not in scores_input.columns:
             print("Error: label column '" + self.config["label_column"] + "' as specified in config file not found in scores file")
             sys.exit(1)
 
-        try:
-            list(scores_input.columns).index(self.config["scores_column"])
-        except ValueError:
+        if self.config["scores_column"] not in scores_input.columns:
             print("Error: scores column '" + self.config["scores_column"] + "' as specified in config file not found in scores file")
             sys.exit(1)
 
         # check metadata_input
-        try:
-            list(speaker_metadata_input.columns).index(self.config["id_column"])
-        except ValueError:
+        if self.config["id_column"] not in speaker_metadata_input.columns:
             print("Error: id column '" + self.config["id_column"] + "' as specified in config file not found in metadata file")
             sys.exit(1)
 
         for select_column in self.config["select_columns"]:
-            try:
-                list(speaker_metadata_input.columns).index(select_column)
-            except ValueError:
+            if select_column not in speaker_metadata_input.columns:
                 print("Error: '" + select_column + "' in select_columns as specified in config file not found in metadata file")
                 sys.exit(1)
 
@@ -239,7 +229,7 @@ class SpeakerBiasTest(BiasTest):
 
         # Calculate average metrics
         fprs, fnrs, thresholds, metric_scores, metric_thresholds = evaluate_scores(self.scores['score'], self.scores['label'], self.config['dcf_costs'])
-        self.error_rates_by_speaker_group.update({"average": pd.DataFrame({'FPRS': fprs, 'FNRS': fnrs, 'Thresholds': thresholds})})
+        self.error_rates_by_speaker_group.update({"average": pd.DataFrame({'FPRS': fprs, 'FNRS': fnrs, 'Thresholds': thresholds}, copy=False)})
         # add string to prepare for SpeakerGroup row
         self.metrics['thresholds'] = ["thresholds"] + metric_thresholds
         self.metrics['average'] = ["average"] + metric_scores
@@ -248,30 +238,39 @@ class SpeakerBiasTest(BiasTest):
 
         # Calculate metrics for each group
         self.scores_by_speaker_groups = split_scores_by_speaker_groups(self.scores, self.speaker_metadata, self.config['speaker_groups'], id_delimiter=self.id_delimiter)
-        for group in self.scores_by_speaker_groups:
-            for subgroup in self.scores_by_speaker_groups[group]:
-                label_score_list = self.scores_by_speaker_groups[group][subgroup]
-                labels, scores = zip(*label_score_list)
-                if all(np.isnan(labels)) or all(np.isnan(scores)):
-                    fprs = []
-                    fnrs = []
-                    thresholds = []
-                    metric_scores = np.empty((len(self.config["dcf_costs"]) + 1))
-                    metric_scores[:] = np.nan
-                    metric_scores = metric_scores.tolist()
-                else:
-                    fprs, fnrs, thresholds, metric_scores = evaluate_scores(scores, labels, self.config['dcf_costs'], threshold_values=self.metrics['thresholds'])
-
-                # if group in keys add to existing DataFrame otherwise create new key
-                if group in self.error_rates_by_speaker_group.keys():
-                    self.error_rates_by_speaker_group[group] = pd.concat([self.error_rates_by_speaker_group[group], pd.DataFrame({'Subgroup': subgroup, 'FPRS': fprs, 'FNRS': fnrs, 'Thresholds': thresholds})])
-                else:
-                    self.error_rates_by_speaker_group.update({group: pd.DataFrame({'Subgroup': subgroup, 'FPRS': fprs, 'FNRS': fnrs, 'Thresholds': thresholds})})
-
-                # for metrics first row is eer, after that follow order of self.config.dcf_costs
-                #self.metrics[subgroup] = [group] + metric_scores -> use concat to avoid performance issues
-                self.metrics = pd.concat([self.metrics, pd.Series([group] + metric_scores).rename(subgroup)], axis=1)
-
+        threshold_values = self.metrics['thresholds'].copy()
+        # metrics of all subgroups are written into a pre-allocated array, one column per subgroup
+        n_subgroups = sum(len(subgroups) for subgroups in self.scores_by_speaker_groups.values())
+        subgroup_names = np.empty(n_subgroups, dtype=object)
+        subgroup_metrics = np.empty((len(self.config["dcf_costs"]) + 2, n_subgroups), dtype=object)
+        column = 0
+        # subgroups are evaluated independently, so they can be spread across n_jobs threads
+        with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+            for group in self.scores_by_speaker_groups:
+                subgroup_results = executor.map(lambda label_score_list: self._evaluate_subgroup(label_score_list, threshold_values),
+                                                self.scores_by_speaker_groups[group].values())
+                # error rates of all subgroups are collected and combined into one DataFrame per group
+                subgroup_error_rates = []
+                for subgroup, (fprs, fnrs, thresholds, metric_scores) in zip(self.scores_by_speaker_groups[group], subgroup_results):
+                    subgroup_error_rates.append((subgroup, fprs, fnrs, thresholds))
+
+                    # for metrics first row is eer, after that follow order of self.config.dcf_costs
+                    subgroup_names[column] = subgroup
+                    subgroup_metrics[0, column] = group
+                    subgroup_metrics[1:, column] = metric_scores
+                    column += 1
+
+                if subgroup_error_rates:
+                    # the concatenated arrays are not used elsewhere, so the DataFrame can take ownership without copying
+                    subgroups, fprs, fnrs, thresholds = zip(*subgroup_error_rates)
+                    sizes = [len(subgroup_fprs) for subgroup_fprs in fprs]
+                    self.error_rates_by_speaker_group.update({group: pd.DataFrame({'Subgroup': np.repeat(np.array(subgroups, dtype=object), sizes),
+                                                                                   'FPRS': np.concatenate(fprs),
+                                                                                   'FNRS': np.concatenate(fnrs),
+                                                                                   'Thresholds': np.concatenate(thresholds)},
+                                                                                  copy=False)})
+
+        self.metrics = pd.concat([self.metrics, pd.DataFrame(subgroup_metrics, columns=subgroup_names)], axis=1)
 
         # format metrics and metrics ratios
         metrics_ratios = compute_metrics_ratios(self.metrics).T
@@ -290,6 +289,32 @@ class SpeakerBiasTest(BiasTest):
 
         return
 
+    def _evaluate_subgroup(self, label_score_list, threshold_values):
+        """ Evaluate the scores of a single subgroup using :py:func:`evaluate.evaluate_scores`. Subgroups without scores return empty error rates and NaN metric scores.
+
+            :param label_score_list: list of tuples (label, score) of the subgroup as constructed by :py:func:`groups.split_scores_by_speaker_groups`
+            :type label_score_list: list
+            :param threshold_values: Series of threshold values computed for the overall dataset
+            :type threshold_values: pandas.Series
+
+            :returns: fprs, fnrs, thresholds, metric_scores
+            :rtype: ndarray, ndarray, ndarray, list
+
+        """
+
+        labels, scores = zip(*label_score_list)
+        if all(np.isnan(labels)) or all(np.isnan(scores)):
+            fprs = []
+            fnrs = []
+            thresholds = []
+            metric_scores = np.empty((len(self.config["dcf_costs"]) + 1))
+            metric_scores[:] = np.nan
+            metric_scores = metric_scores.tolist()
+        else:
+            fprs, fnrs, thresholds, metric_scores = evaluate_scores(scores, labels, self.config['dcf_costs'], threshold_values=threshold_values)
+
+        return fprs, fnrs, thresholds, metric_scores
+
     def evaluate_dataset(self):
 
         # TODO: implement method
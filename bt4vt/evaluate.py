@@ -4,23 +4,28 @@
 # Created on 18-05-2021
 # @author: wiebket
 
+import numpy as np
 import sklearn.metrics as sklearn_metrics
-from .metrics import compute_eer, compute_min_cdet, compute_cdet_at_threshold
+from .metrics import compute_eer, compute_eer_and_min_cdet, compute_cdets_at_thresholds
 
 
 def compute_fpfnth(scores, labels):
     """ Calculation of False Positive Rates and False Negative Rates and corresponding thresholds
 
-    :param scores: Series of scores
-    :type scores: pandas.Series
-    :param labels: Series of labels; labels have to be either {-1,1} or {0,1}
-    :type labels: pandas.Series
+    :param scores: Series or array of scores
+    :type scores: pandas.Series or ndarray
+    :param labels: Series or array of labels; labels have to be either {-1,1} or {0,1}
+    :type labels: pandas.Series or ndarray
 
     :returns: fprs, fnrs, thresholds
     :rtype: ndarray, ndarray, ndarray
 
     """
 
+    # pass plain arrays so that sklearn does not have to convert pandas objects on every call
+    scores = np.asarray(scores, dtype=np.float64)
+    # labels keep their dtype so that sklearn still rejects NaN or invalid label values
+    labels = np.asarray(labels)
     fprs, fnrs, thresholds = sklearn_metrics.det_curve(labels, scores, pos_label=1)
 
     return fprs, fnrs, thresholds
@@ -47,27 +52,18 @@ def evaluate_scores(scores, labels, dcf_costs, threshold_values=None):
 
     fprs, fnrs, thresholds = compute_fpfnth(scores, labels)
 
-    metric_scores = []
-    metric_thresholds = []
-
-    eer, eer_threshold = compute_eer(fprs, fnrs, thresholds)
-    metric_scores.append(eer)
-    metric_thresholds.append(eer_threshold)
     # TODO: error handling check that dcf_cost is not empty
     # this is the average case
     if threshold_values is None:
-        for cost in dcf_costs:
-            min_cdet, min_cdet_threshold = compute_min_cdet(fprs, fnrs, thresholds, cost[0], cost[1], cost[2])
-            metric_scores.append(min_cdet)
-            metric_thresholds.append(min_cdet_threshold)
+        # eer and min_cdet for all costs are computed in a single scan
+        metric_scores, metric_thresholds = compute_eer_and_min_cdet(fprs, fnrs, thresholds, dcf_costs)
 
         return fprs, fnrs, thresholds, metric_scores, metric_thresholds
     # this is the group case
     else:
+        eer, eer_threshold = compute_eer(fprs, fnrs, thresholds)
         # TODO error handling check that threshold_values is length(dcf_costs) + 2 as first one refers to subgroup and second to eer
-        for index, cost in enumerate(dcf_costs):
-            cdet_at_threshold = compute_cdet_at_threshold(fprs, fnrs, thresholds, threshold_values[index + 2], cost[0],
-                                                          cost[1], cost[2])
-            metric_scores.append(cdet_at_threshold)
+        cdet_threshold_values = [threshold_values[index + 2] for index in range(len(dcf_costs))]
+        metric_scores = [eer] + compute_cdets_at_thresholds(fprs, fnrs, thresholds, cdet_threshold_values, dcf_costs)
 
         return fprs, fnrs, thresholds, metric_scores
@@ -28,43 +28,43 @@ def split_scores_by_speaker_groups(scores, speaker_metadata, speaker_groups, id_
     scores_by_speaker_groups = dict()
 
     # create id column for scores, first split by dot to get rid of .wav, then by id_delimiter
-    scores['ref_id'] = scores['ref'].apply(lambda x: x.split(".")[0]).apply(lambda x: x.split(id_delimiter)[0])
+    scores['ref_id'] = scores['ref'].str.split(".", n=1, regex=False).str[0].str.split(id_delimiter, n=1, regex=False).str[0]
+    # row positions of the scores for each speaker id, computed once and shared by all speaker groups
+    score_rows_by_id = scores.groupby('ref_id', sort=False).indices
 
     for group in speaker_groups:
-        subgroup_per_group = dict()
-        group_copy = group.copy()
+        subgroup_per_group = {group_name: list(speaker_metadata[group_name].unique()) for group_name in group}
 
-        while len(group_copy) > 0:
-            group_name = group_copy[0]
-            subgroups = list(speaker_metadata[group_name].unique())
-            subgroup_per_group.update({group_name: subgroups})
-            group_copy.pop(0)
-
-        scores_by_speaker_groups["_".join(subgroup_per_group.keys())] = dict()
+        # group and subgroup names are joined once and reused for all updates
+        scores_by_subgroup = scores_by_speaker_groups["_".join(subgroup_per_group.keys())] = dict()
         # for a list of subgroups for groups create category combination
         # e.g. Gender: [m, f], Nationality: [India] becomes [(m, India), (f, India)]
         subgroups_combinations = list(itertools.product(*subgroup_per_group.values()))
 
-        for combination in subgroups_combinations:
-            subgroup_dataframe = speaker_metadata
-            for index, subcategory in enumerate(combination):
-                subgroup_dataframe = subgroup_dataframe.loc[subgroup_dataframe[list(subgroup_per_group.keys())[index]] == subcategory]
+        # partition speaker_metadata into subgroups in a single pass instead of masking it for every combination
+        ids_by_subgroup = dict()
+        for key, subgroup_dataframe in speaker_metadata.groupby(group, sort=False, observed=True):
+            ids_by_subgroup[key if isinstance(key, tuple) else (key,)] = subgroup_dataframe["id"]
 
+        for combination in subgroups_combinations:
+            subgroup_name = "_".join(combination)
             # subgroup combination not available in speaker_metadata
-            if subgroup_dataframe.empty:
-                scores_by_speaker_groups["_".join(subgroup_per_group.keys())].update({"_".join(combination): [(np.nan, np.nan)]})
+            if combination not in ids_by_subgroup:
+                scores_by_subgroup[subgroup_name] = [(np.nan, np.nan)]
                 # TODO logging here
                 continue
 
-            id_list = subgroup_dataframe["id"]
-            scores_filtered = scores[scores['ref_id'].isin(id_list)]
+            id_list = ids_by_subgroup[combination]
+            score_rows = [score_rows_by_id[speaker_id] for speaker_id in id_list.unique() if speaker_id in score_rows_by_id]
 
             # speaker id in metadata but no scores provided
-            if scores_filtered.empty:
-                scores_by_speaker_groups["_".join(subgroup_per_group.keys())].update({"_".join(combination): [(np.nan, np.nan)]})
+            if len(score_rows) == 0:
+                scores_by_subgroup[subgroup_name] = [(np.nan, np.nan)]
                 # TODO Logging here
                 continue
 
+            # keep scores in their original order
+            scores_filtered = scores.iloc[np.sort(np.concatenate(score_rows))]
             label_score_list = scores_filtered[["label", "score"]].to_records(index=False)
-            scores_by_speaker_groups["_".join(subgroup_per_group.keys())].update({"_".join(combination): label_score_list})
+            scores_by_subgroup[subgroup_name] = label_score_list
     return scores_by_speaker_groups
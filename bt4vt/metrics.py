@@ -5,7 +5,7 @@
 # @author: wiebket, AnnaLesch
 
 import numpy as np
-import scipy as sp
+from scipy.special import ndtri
 import pandas as pd
 
 #########################################
@@ -60,8 +60,8 @@ def compute_min_cdet(fprs, fnrs, thresholds, dcf_p_target, dcf_c_fp, dcf_c_fn):
     :rtype: float, float
     """
 
-    cdet = np.array([fnr * dcf_c_fn * dcf_p_target for fnr in fnrs]) + np.array(
-        [fpr * dcf_c_fp * (1 - dcf_p_target) for fpr in fprs])
+    # keep the multiplication order of the cdet definition so that results do not change in the last bits
+    cdet = np.asarray(fnrs) * dcf_c_fn * dcf_p_target + np.asarray(fprs) * dcf_c_fp * (1 - dcf_p_target)
     min_ix = np.nanargmin(cdet)
     min_cdet = cdet[min_ix]
     min_cdet_threshold = thresholds[min_ix]
@@ -69,6 +69,82 @@ def compute_min_cdet(fprs, fnrs, thresholds, dcf_p_target, dcf_c_fp, dcf_c_fn):
     return min_cdet, min_cdet_threshold
 
 
+def compute_eer_and_min_cdet(fprs, fnrs, thresholds, dcf_costs):
+    """Computation of the Equal Error Rate and the minimum of the detection cost function for all dcf_costs, together with their thresholds.
+    Results are identical to :py:func:`compute_eer` and :py:func:`compute_min_cdet`, but all minima are found with one nanargmin call.
+
+    :param fprs: Array of False Positive Rates
+    :type fprs: ndarray
+    :param fnrs: Array of False Negative Rates
+    :type fnrs: ndarray
+    :param thresholds: Array of Threshold values corresponding to fprs and fnrs
+    :type thresholds: ndarray
+    :param dcf_costs: list of tuples specifying the weights for the detection cost function (dcf_p_target, dcf_c_fp, dcf_c_fn)
+    :type dcf_costs: list
+
+    :returns: metric_scores, metric_thresholds where the first element corresponds to the eer, all other elements correspond to the min_cdet scores in the order of dcf_costs
+    :rtype: list, list
+    """
+
+    fprs = np.asarray(fprs)
+    fnrs = np.asarray(fnrs)
+    costs = np.asarray(dcf_costs, dtype=np.float64).reshape(-1, 3)
+    p_target = costs[:, [0]]
+
+    # first row holds the eer distance, the following rows hold cdet for each cost
+    scan = np.empty((len(costs) + 1, len(fprs)))
+    np.absolute(fnrs - fprs, out=scan[0])
+    # cdet rows are built in place in the multiplication order of compute_min_cdet so that results are bit-identical
+    cdet = scan[1:]
+    np.multiply.outer(costs[:, 2], fnrs, out=cdet)
+    cdet *= p_target
+    cdet += np.multiply.outer(costs[:, 1], fprs) * (1 - p_target)
+    min_ix = np.nanargmin(scan, axis=1)
+
+    eer = max(fprs[min_ix[0]], fnrs[min_ix[0]]) * 100
+    metric_scores = [eer] + list(scan[np.arange(1, len(scan)), min_ix[1:]])
+    metric_thresholds = [thresholds[ix] for ix in min_ix]
+
+    return metric_scores, metric_thresholds
+
+
+def _closest_threshold_index(thresholds, threshold_values):
+    """Index of the threshold closest to each threshold value. thresholds must be sorted in increasing order, as returned by
+    :py:func:`evaluate.compute_fpfnth`, so that a binary search can be used. The result is identical to an argmin over the absolute
+    differences: ties resolve to the lower index and non-finite threshold values fall back to that full scan.
+
+    :param thresholds: Array of Threshold values sorted in increasing order
+    :type thresholds: ndarray
+    :param threshold_values: Threshold value(s) to find the closest threshold for
+    :type threshold_values: float or ndarray
+
+    :returns: min_ix
+    :rtype: int or ndarray
+
+    """
+    thresholds = np.asarray(thresholds)
+    threshold_values = np.asarray(threshold_values, dtype=np.float64)
+    position = np.searchsorted(thresholds, threshold_values)
+
+    # values below the first or above the last threshold are closest to that end of the array
+    upper = np.minimum(position, len(thresholds) - 1)
+    lower = np.maximum(position - 1, 0)
+    # inside the array thresholds[lower] < threshold_value <= thresholds[upper], only these two neighbours can be closest
+    inside = (position > 0) & (position < len(thresholds))
+    with np.errstate(invalid="ignore"):
+        # inf - inf only occurs for non-finite values, which are replaced below
+        take_lower = inside & (np.abs(thresholds[lower] - threshold_values) <= np.abs(thresholds[upper] - threshold_values))
+    min_ix = np.where(take_lower, lower, upper)
+
+    # non-finite values (e.g. the inf threshold added by det_curve) keep the index of a full abs-diff argmin
+    non_finite = ~np.isfinite(threshold_values)
+    if np.any(non_finite):
+        full_scan_ix = np.abs(np.subtract.outer(threshold_values, thresholds)).argmin(axis=-1)
+        min_ix = np.where(non_finite, full_scan_ix, min_ix)
+
+    return min_ix
+
+
 def get_fpfn_at_threshold(fprs, fnrs, thresholds, threshold_value, ppf_norm=False):
     """Get the False Positive Rate and False Negative Rate at a given threshold value.
 
@@ -76,7 +152,7 @@ def get_fpfn_at_threshold(fprs, fnrs, thresholds, threshold_value, ppf_norm=Fals
     :type fprs: ndarray
     :param fnrs: Array of False Negative Rates
     :type fnrs: ndarray
-    :param thresholds: Array of Threshold values corresponding to fprs and fnrs
+    :param thresholds: Array of Threshold values corresponding to fprs and fnrs, sorted in increasing order
     :type thresholds: ndarray
     :param threshold_value: Threshold value to get fpr and fnr for i.e. min_cdet_threshold
     :type threshold_value: float
@@ -88,14 +164,13 @@ def get_fpfn_at_threshold(fprs, fnrs, thresholds, threshold_value, ppf_norm=Fals
 
     """
     # Find the index in df that is closest to the SUBGROUP minimum threshold value
-    threshold_diff = np.array([abs(i - threshold_value) for i in thresholds])
+    min_ix = _closest_threshold_index(thresholds, threshold_value)
 
+    fpr_at_threshold = fprs[min_ix]
+    fnr_at_threshold = fnrs[min_ix]
     if ppf_norm:
-        fpr_at_threshold = sp.stats.norm.ppf(fprs)[np.ndarray.argmin(threshold_diff)]
-        fnr_at_threshold = sp.stats.norm.ppf(fnrs)[np.ndarray.argmin(threshold_diff)]
-    else:
-        fpr_at_threshold = fprs[np.ndarray.argmin(threshold_diff)]
-        fnr_at_threshold = fnrs[np.ndarray.argmin(threshold_diff)]
+        # only the selected rates are normalised, not the full arrays
+        fpr_at_threshold, fnr_at_threshold = ndtri([fpr_at_threshold, fnr_at_threshold])
 
     return fpr_at_threshold, fnr_at_threshold
 
@@ -109,7 +184,7 @@ def compute_cdet_at_threshold(fprs, fnrs, thresholds, threshold_value, dcf_p_tar
     :type fprs: ndarray
     :param fnrs: Array of False Negative Rates
     :type fnrs: ndarray
-    :param thresholds: Array of Threshold values corresponding to fprs and fnrs
+    :param thresholds: Array of Threshold values corresponding to fprs and fnrs, sorted in increasing order
     :type thresholds: ndarray
     :param threshold_value: Threshold value to compute detection cost function for
     :type threshold_value: float
@@ -131,6 +206,36 @@ def compute_cdet_at_threshold(fprs, fnrs, thresholds, threshold_value, dcf_p_tar
     return cdet_at_threshold
 
 
+def compute_cdets_at_thresholds(fprs, fnrs, thresholds, threshold_values, dcf_costs):
+    """Computation of the detection cost function for all dcf_costs at their corresponding threshold values.
+    Results are identical to calling :py:func:`compute_cdet_at_threshold` for each cost, but the thresholds are looked up in a single scan.
+
+    :param fprs: Array of False Positive Rates
+    :type fprs: ndarray
+    :param fnrs: Array of False Negative Rates
+    :type fnrs: ndarray
+    :param thresholds: Array of Threshold values corresponding to fprs and fnrs, sorted in increasing order
+    :type thresholds: ndarray
+    :param threshold_values: Threshold values to compute the detection cost function for, one per cost in dcf_costs
+    :type threshold_values: list
+    :param dcf_costs: list of tuples specifying the weights for the detection cost function (dcf_p_target, dcf_c_fp, dcf_c_fn)
+    :type dcf_costs: list
+
+    :returns: cdets_at_thresholds
+    :rtype: list
+
+    """
+
+    threshold_values = np.asarray(threshold_values, dtype=np.float64)
+    costs = np.asarray(dcf_costs, dtype=np.float64).reshape(-1, 3)
+
+    # index of the closest threshold for every threshold value
+    min_ix = _closest_threshold_index(thresholds, threshold_values)
+    cdets = np.asarray(fprs)[min_ix] * costs[:, 1] * (1 - costs[:, 0]) + np.asarray(fnrs)[min_ix] * costs[:, 2] * costs[:, 0]
+
+    return list(cdets)
+
+
 #########################################
 # In this section we compute bias metrics
 # 1. Ratio of group mincdet / average mincdet
@@ -99,14 +99,18 @@ def score_overlap(df, metrics):
 
     score_overlap = {}
 
-    for subgroup in list(df['subgroup'].unique()):
+    # partition df by subgroup once and build the label masks once per subgroup
+    for subgroup, sg_df in df.groupby('subgroup', sort=False, dropna=False):
         eer_threshold = metrics[subgroup]['eer_threshold']
-        min_sc = df[(df['subgroup'] == subgroup) & (df['lab'] == 1)]['sc'].min()
-        max_sc = df[(df['subgroup'] == subgroup) & (df['lab'] == 0)]['sc'].max()
-        overlap_fn = df[(df['subgroup'] == subgroup) & (df['lab'] == 1) & (df['sc'] >= min_sc) & (df['sc'] <= eer_threshold)]['sc'].count()
-        overlap_fp = df[(df['subgroup'] == subgroup) & (df['lab'] == 0) & (df['sc'] >= eer_threshold) & (df['sc'] <= max_sc)]['sc'].count()
+        sc = sg_df['sc']
+        target = sg_df['lab'] == 1
+        non_target = sg_df['lab'] == 0
+        min_sc = sc[target].min()
+        max_sc = sc[non_target].max()
+        overlap_fn = sc[target & (sc >= min_sc) & (sc <= eer_threshold)].count()
+        overlap_fp = sc[non_target & (sc >= eer_threshold) & (sc <= max_sc)].count()
         overlap_total = overlap_fn + overlap_fp
-        total_instances = df[df['subgroup'] == subgroup]['sc'].count()
+        total_instances = sc.count()
         overlap_probability = overlap_total / total_instances
 
         score_overlap[subgroup] = overlap_probability
@@ -25,12 +25,15 @@ def voxceleb_scores_with_demographics(score_file, meta_file, **kwargs):
     # Get the scores for each pair of segments
     df = pd.read_csv(score_file)
 
-    df['ref_id'] = df['ref_file'].apply(lambda x: x.split('/')[0])
-    df['ref_video'] = df['ref_file'].apply(lambda x: x.split('/')[1])
-    df['ref_seg'] = df['ref_file'].apply(lambda x: x.split('/')[2].split('.')[0])
-    df['com_id'] = df['com_file'].apply(lambda x: x.split('/')[0])
-    df['com_video'] = df['com_file'].apply(lambda x: x.split('/')[1])
-    df['com_seg'] = df['com_file'].apply(lambda x: x.split('/')[2].split('.')[0])
+    # split file paths into id, video and segment with vectorised string operations
+    ref_parts = df['ref_file'].str.split('/', expand=True)
+    df['ref_id'] = ref_parts[0]
+    df['ref_video'] = ref_parts[1]
+    df['ref_seg'] = ref_parts[2].str.split('.', n=1, regex=False).str[0].astype("str")
+    com_parts = df['com_file'].str.split('/', expand=True)
+    df['com_id'] = com_parts[0]
+    df['com_video'] = com_parts[1]
+    df['com_seg'] = com_parts[2].str.split('.', n=1, regex=False).str[0].astype("str")
 
     # Get demographic metadata
     v1_meta = pd.read_csv(meta_file, **kwargs)
@@ -72,7 +75,9 @@ def voxceleb_scores_with_demographics(score_file, meta_file, **kwargs):
     demo_df['same_nat'] = np.where(demo_df['ref_nationality'] == demo_df['com_nationality'], 1, 0)
     demo_df['same_sg'] = np.where((demo_df['ref_gender'] == demo_df['com_gender']) &
                                   (demo_df['ref_nationality'] == demo_df['com_nationality']), 1, 0)
-    demo_df['subgroup'] = ['_'.join(z) for z in zip(demo_df['ref_nationality'].apply(lambda x: x.replace(" ", "").lower()), demo_df['ref_gender'])]
+    # normalise nationality once for the whole column, e.g. "New Zealand" becomes "newzealand"
+    ref_nationality_key = demo_df['ref_nationality'].str.replace(" ", "", regex=False).str.lower()
+    demo_df['subgroup'] = ref_nationality_key + '_' + demo_df['ref_gender']
 
     return demo_df
 
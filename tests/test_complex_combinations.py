@@ -50,3 +50,27 @@ class TestComplexCombinations:
         assert filecmp.cmp("./tests/complex_tests/results/biastest_results_config_3_scores_3.csv",
                             "./tests/complex_tests/reference_results/reference_biastest_results_config_3_scores_3.csv",
                             shallow=False) == True
+
+    def test_infinite_threshold(self):
+        # Test Case 4: Top scoring trial is a non-target, so the average min_cdet threshold is inf
+        config_4 = "./tests/complex_tests/config_4.yaml"
+        scores_4 = "./tests/complex_tests/scores_4.csv"
+
+        test_4 = bt4vt.core.SpeakerBiasTest(scores_4, config_4)
+        test_4.run_tests()
+
+        assert filecmp.cmp("./tests/complex_tests/results/biastest_results_config_4_scores_4.csv",
+                           "./tests/complex_tests/reference_results/reference_biastest_results_config_4_scores_4.csv",
+                           shallow=False) == True
+
+    def test_non_unit_costs(self):
+        # Test Case 5: Several dcf_costs with non-unit weights, min_cdet scores must match the reference bit for bit
+        config_5 = "./tests/complex_tests/config_5.yaml"
+        scores_5 = "./tests/complex_tests/scores_5.csv"
+
+        test_5 = bt4vt.core.SpeakerBiasTest(scores_5, config_5)
+        test_5.run_tests()
+
+        assert filecmp.cmp("./tests/complex_tests/results/biastest_results_config_5_scores_5.csv",
+                           "./tests/complex_tests/reference_results/reference_biastest_results_config_5_scores_5.csv",
+                           shallow=False) == True
@@ -73,3 +73,34 @@ class TestConfigInput:
         scores_5c = "./tests/configfile_tests/scores_5c.csv"
 
         pytest.raises(ValueError, bt4vt.core.SpeakerBiasTest, scores_5c, config_5c)
+
+    def test_n_jobs(self):
+        # Test Case 6: Subgroups evaluated in multiple threads give the same results as Test Case 4
+        config_6 = "./tests/configfile_tests/config_6.yaml"
+        scores_4 = "./tests/configfile_tests/scores_4.csv"
+
+        test_6 = bt4vt.core.SpeakerBiasTest(scores_4, config_6)
+        test_6.run_tests()
+
+        assert filecmp.cmp("./tests/configfile_tests/results/biastest_results_config_6_scores_4.csv",
+                           "./tests/configfile_tests/reference_results/reference_biastest_results_config_4_scores_4.csv",
+                           shallow=False) == True
+
+    def test_invalid_n_jobs(self):
+        # Test Case 7: n_jobs must be a positive integer or -1
+        config_7 = "./tests/configfile_tests/config_7.yaml"
+        scores_4 = "./tests/configfile_tests/scores_4.csv"
+
+        pytest.raises(SystemExit, bt4vt.core.SpeakerBiasTest, scores_4, config_7)
+
+    def test_all_cores_n_jobs(self):
+        # Test Case 8: n_jobs -1 uses all CPU cores and gives the same results as Test Case 4
+        config_8 = "./tests/configfile_tests/config_8.yaml"
+        scores_4 = "./tests/configfile_tests/scores_4.csv"
+
+        test_8 = bt4vt.core.SpeakerBiasTest(scores_4, config_8)
+        test_8.run_tests()
+
+        assert filecmp.cmp("./tests/configfile_tests/results/biastest_results_config_8_scores_4.csv",
+                           "./tests/configfile_tests/reference_results/reference_biastest_results_config_4_scores_4.csv",
+                           shallow=False) == True